@@ -71,9 +71,9 @@ df['keyword_cleaned'] = data_cleaner.clean_text_column(df['keyword'])   # Clean
 
 # Token filtering and question detection
 
-df['title_filtered_tokens'] = df['title_cleaned'].apply(data_preprocessing.filtered_stopwords)  # Remove stopwords
-df['question_text_validated'] = df['title_cleaned'].apply(data_preprocessing.is_question)       # Keep valid questions
-df['question_type'] = df['question_text_validated'].apply(data_preprocessing.get_question_type) # Get question type
+df['title_filtered_tokens'] = data_preprocessing.remove_stopwords(df['title_cleaned'])           # Remove stopwords
+df['question_text_validated'] = data_preprocessing.detect_questions(df['title_cleaned'])         # Keep valid questions
+df['question_type'] = data_preprocessing.get_question_types(df['question_text_validated'])       # Get question type
 
 
 # ========== 4. Refine Dataset ==========
@@ -82,18 +82,32 @@ df = data_preprocessing.add_question_length(df)   # Add a new feature: question
 
 
 # ========== 5. Named Entity Recognition ==========
-df['extracted_entities'] = df['title'].apply(ner.extract_entities)  # Extract entities using spaCy
+# NER is case/punctuation-sensitive and returns offsets into the raw text, so dedupe on the raw title
+ner_results = df[['title']].drop_duplicates().reset_index(drop=True)
+ner_results['extracted_entities'] = ner.extract_entities_batch(ner_results['title'].fillna('').tolist())  # Extract entities using spaCy
+df = df.merge(ner_results, on='title', how='left')
 
 
 # ========== 6. Funnel Stage Classification ==========
-texts = df['title_cleaned'].fillna("").tolist()
-result_df = classifier.batch_zero_shot_predict(texts)               # Predict funnel stage + confidence score
-df[['funnel_stage', 'confidence']] = result_df                      # Assign prediction results
+# The classifier only sees cleaned text, so dedupe on the cleaned title
+funnel_results = df[['title_cleaned']].drop_duplicates().reset_index(drop=True)
+texts = funnel_results['title_cleaned'].fillna("").tolist()
+if os.getenv("FUNNEL_CLASSIFIER", "zero-shot") == "embedding":
+    result_df = classifier.batch_embedding_predict(texts)           # Cheap embedding-similarity classifier
+else:
+    result_df = classifier.batch_zero_shot_predict(texts)           # Predict funnel stage + confidence score
+funnel_results[['funnel_stage', 'confidence']] = result_df          # Assign prediction results
+df = df.merge(funnel_results, on='title_cleaned', how='left')
+
+# Small fixed vocabularies: store as categoricals (int codes) instead of Python strings
+df['funnel_stage'] = df['funnel_stage'].astype(classifier.funnel_stage_dtype)
+df['question_type'] = df['question_type'].astype('category')
 
 
 # ========== 7. Save Cleaned Dataset ==========
 output_file = os.getenv("OUTPUT_FILE")
-df.to_csv(output_file, index=False)
+output_file = data_loader.save_dataset(df, output_file)             # Parquet by default, CSV if OUTPUT_FORMAT=csv
+print(f"💾 Saved dataset: {output_file}")
 
 # df.to_csv('data/output/questions_final.csv', index=False)           # Persist output
 
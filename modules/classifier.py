@@ -1,69 +1,371 @@
 # modules/classifier.py
 
 # Import necessary libraries
-from transformers import pipeline         # Hugging Face pipeline for NLP tasks
+import os                                 # For thread/tokenizer environment settings
+from transformers import pipeline, AutoTokenizer  # Hugging Face pipeline for NLP tasks
 import pandas as pd                       # For working with tabular data
+import numpy as np                        # For sorting texts by token length
+import torch                              # For device and precision selection
 from tqdm import tqdm                     # For displaying progress bars
 import logging                            # For logging warnings and errors
+import time                               # For timing the batch size sweep
 
-# Initialize a zero-shot classification pipeline using a pre-trained BART model
-classifier = pipeline("zero-shot-classification", model="facebook/bart-large-mnli")
+# Let the fast tokenizer use all cores (must be set before the tokenizer is first used)
+os.environ.setdefault("TOKENIZERS_PARALLELISM", "true")
+
+# Run on the first GPU in half precision when available, otherwise fall back to CPU fp32
+device = 0 if torch.cuda.is_available() else -1
+dtype = torch.float16 if torch.cuda.is_available() else torch.float32
+
+# Zero-shot NLI model; on CPU it can optionally run as an int8 ONNX model (ZERO_SHOT_ONNX=1)
+zero_shot_model_name = "facebook/bart-large-mnli"
+onnx_model_dir = os.getenv("ONNX_MODEL_DIR", "models/bart-mnli-int8")
 
 # Define the candidate labels for classification
 labels = ["TOFU", "MOFU", "BOFU"]  # TOFU: Top of Funnel, MOFU: Middle, BOFU: Bottom
 
-def batch_zero_shot_predict(texts, batch_size=8):
+# Fixed set of values the 'funnel_stage' column can hold (labels plus placeholders)
+funnel_stage_dtype = pd.CategoricalDtype(labels + ["skipped", "error"])
+
+# Default batch size, candidate batch sizes for the one-off GPU sweep, and the winner once measured
+default_batch_size = 64
+batch_size_candidates = (32, 64, 128, 256)
+_best_batch_size = None
+
+# Embedding-similarity alternative: one short prototype sentence per funnel stage
+embedding_model_name = "sentence-transformers/all-MiniLM-L6-v2"
+label_prototypes = {
+    "TOFU": "top of funnel awareness question",
+    "MOFU": "middle of funnel evaluation question",
+    "BOFU": "bottom of funnel decision question",
+}
+_embedder = None
+_label_emb = None
+
+# Zero-shot pipeline, built on first use so importing this module doesn't load BART
+_PIPE = None
+
+
+def _get_pipe():
+    """
+    Return the zero-shot classification pipeline, creating it on first call.
+
+    Returns:
+    --------
+    transformers.Pipeline
+        A zero-shot classification pipeline using a pre-trained BART model.
+    """
+    global _PIPE
+    if _PIPE is None:
+        if device == -1:
+            torch.set_num_threads(os.cpu_count() or 1)  # Use every core for CPU inference
+
+            if os.getenv("ZERO_SHOT_ONNX"):
+                _PIPE = _build_onnx_pipe()
+                if _PIPE is not None:
+                    return _PIPE
+
+        _PIPE = pipeline(
+            "zero-shot-classification",
+            model=zero_shot_model_name,
+            device=device,
+            torch_dtype=dtype,
+            batch_size=default_batch_size,
+            model_kwargs={"attn_implementation": "sdpa"}  # Fused scaled-dot-product attention kernels
+        )
+
+        if device == 0:
+            _compile_model(_PIPE)
+    return _PIPE
+
+
+def _build_onnx_pipe():
+    """
+    Build the zero-shot pipeline on an int8-quantized ONNX Runtime export of the model.
+    The export and dynamic quantization run once and are cached in `onnx_model_dir`.
+
+    Returns:
+    --------
+    transformers.Pipeline or None
+        The ONNX-backed pipeline, or None if optimum can't be imported or the export fails
+        (the caller then falls back to the PyTorch model).
+    """
+    try:
+        # Optional dependency, imported only when the ONNX path is requested
+        from optimum.onnxruntime import ORTModelForSequenceClassification, ORTQuantizer
+        from optimum.onnxruntime.configuration import AutoQuantizationConfig
+    except Exception as e:
+        # Missing, or installed but incompatible with the pinned transformers
+        logging.warning(f"ZERO_SHOT_ONNX is set but optimum[onnxruntime] could not be imported; using PyTorch: {e}")
+        return None
+
+    quantized_path = os.path.join(onnx_model_dir, "model_quantized.onnx")
+
+    try:
+        # Check for the quantized file itself: a failed export can leave an empty directory behind
+        if not os.path.isfile(quantized_path):
+            # One-time export to ONNX, then int8 dynamic quantization (AVX-512 VNNI kernels)
+            # The quantized model is written last, so its presence means the cache is complete
+            model = ORTModelForSequenceClassification.from_pretrained(zero_shot_model_name, export=True)
+            model.config.save_pretrained(onnx_model_dir)
+            AutoTokenizer.from_pretrained(zero_shot_model_name).save_pretrained(onnx_model_dir)
+            quantizer = ORTQuantizer.from_pretrained(model)
+            quantizer.quantize(
+                save_dir=onnx_model_dir,
+                quantization_config=AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=False)
+            )
+
+        model = ORTModelForSequenceClassification.from_pretrained(
+            onnx_model_dir, file_name=os.path.basename(quantized_path)
+        )
+        tokenizer = AutoTokenizer.from_pretrained(onnx_model_dir)
+        return pipeline("zero-shot-classification", model=model, tokenizer=tokenizer, batch_size=default_batch_size)
+
+    except Exception as e:
+        logging.error(f"ONNX export/quantization failed, using PyTorch: {e}")
+        return None
+
+
+def _compile_model(pipe):
+    """
+    Compile the pipeline's model forward pass with `torch.compile` and run a warm-up batch.
+    Only used on GPU; if compilation is unavailable or fails, the eager model is kept.
+
+    Parameters:
+    -----------
+    pipe : transformers.Pipeline
+        The zero-shot pipeline whose model should be compiled.
+    """
+    eager_forward = pipe.model.forward
+    try:
+        # Default mode: fused kernels without CUDA graphs (length-sorted batches give nearly every
+        # batch a new padded shape) and without the long Triton autotuning of the max-autotune modes
+        pipe.model.forward = torch.compile(pipe.model.forward, dynamic=True)
+
+        # Pay the one-off compilation cost up front rather than inside the progress bar
+        pipe(["warm up the compiled model"], candidate_labels=labels)
+    except Exception as e:
+        logging.warning(f"torch.compile failed, using eager model: {e}")
+        pipe.model.forward = eager_forward
+
+
+def pick_batch_size(texts, candidates=batch_size_candidates, sample_size=512, min_texts_factor=20):
+    """
+    Time the pipeline on a sample of texts for each candidate batch size and return the fastest.
+    The sweep runs once per process; later calls reuse the measured value.
+
+    Measuring costs several passes over the sample, so it only runs on GPU and only when the
+    input is much larger than the sample; otherwise `default_batch_size` is returned.
+
+    Parameters:
+    -----------
+    texts : list of str
+        Texts to draw the timing sample from (sorted by length; the sample is strided across them).
+    candidates : tuple of int
+        Batch sizes to try (sizes not smaller than the sample are skipped).
+    sample_size : int
+        Number of texts used for each timing run (at least twice the largest candidate,
+        so every candidate is timed over more than one batch).
+    min_texts_factor : int
+        The sweep only runs if there are at least `min_texts_factor * sample_size` texts.
+
+    Returns:
+    --------
+    int
+        The batch size with the lowest wall-clock time on the sample.
+    """
+    global _best_batch_size
+    if _best_batch_size is not None:
+        return _best_batch_size
+
+    if device != 0 or len(texts) < min_texts_factor * sample_size:
+        return default_batch_size
+
+    # Stride across the length-sorted texts so the sample covers short and long inputs alike
+    step = len(texts) // sample_size
+    sample = texts[::step][:sample_size]
+    sizes = [size for size in candidates if size < len(sample)]
+    if not sizes:
+        return default_batch_size
+
+    pipe = _get_pipe()
+
+    try:
+        # Untimed warm-up so cold-start costs don't land on the first candidate
+        pipe(sample[:sizes[0]], candidate_labels=labels, batch_size=sizes[0])
+    except Exception as e:
+        logging.warning(f"Batch size sweep warm-up failed, using default: {e}")
+        return default_batch_size
+
+    timings = {}
+    for size in sizes:
+        try:
+            start = time.perf_counter()
+            pipe(sample, candidate_labels=labels, batch_size=size)
+            timings[size] = time.perf_counter() - start
+        except Exception as e:
+            # Typically an out-of-memory error on large batches; stop growing the batch
+            logging.warning(f"Batch size {size} failed during sweep: {e}")
+            break
+
+    _best_batch_size = min(timings, key=timings.get) if timings else default_batch_size
+    return _best_batch_size
+
+
+def batch_zero_shot_predict(texts, batch_size=None):
     """
     Perform zero-shot classification on a list of input texts using a specified batch size.
     We use Hugging Face's pipeline with the labels above and run it in batches for efficiency. This step gives marketing insight into where each question fits in the customer journey.
-    
+
+    Valid texts are sorted by token length and passed to the pipeline in a single call, so each
+    internal batch pads to a similar length; results are restored to the original input order afterwards.
+
     Parameters:
     -----------
     texts : list of str
         A list of text inputs to be classified.
-    batch_size : int, optional (default=8)
+    batch_size : int, optional (default=None)
         Number of texts to classify in each batch for efficient processing.
+        If None, `pick_batch_size` chooses it (a one-off sweep on large GPU runs, else `default_batch_size`).
 
     Returns:
     --------
     pd.DataFrame
         A DataFrame with predicted 'funnel_stage' and associated 'confidence' score for each input text.
         If a text is invalid or classification fails, returns a placeholder entry with 'skipped' or 'error'.
+        On failure, texts already classified are kept and the rest are retried with halved batch sizes.
     """
 
-    results = []
-
-    # Iterate over the input texts in batches
-    for i in tqdm(range(0, len(texts), batch_size), desc="Zero-shot classification"):
-        batch_raw = texts[i:i + batch_size]
-
-        # Clean and validate batch inputs (remove empty strings or non-string types)
-        batch = [text for text in batch_raw if isinstance(text, str) and text.strip()]
-        
-        if not batch:
-            # Log and skip empty or invalid batch
-            logging.warning(f"Skipped empty batch at index {i}")
-            results.extend([{"funnel_stage": "skipped", "confidence": 0}] * len(batch_raw))
-            continue
-        
-        try:
-            # Run zero-shot classification
-            outputs = classifier(batch, labels)
+    # Validate inputs once up front (empty strings and non-string types are skipped)
+    valid_idx = [i for i, text in enumerate(texts) if isinstance(text, str) and text.strip()]
+    results = [{"funnel_stage": "skipped", "confidence": 0}] * len(texts)
+
+    if not valid_idx:
+        return pd.DataFrame(results, columns=["funnel_stage", "confidence"])
+
+    # Sort the valid texts by token length and remember their original positions
+    classifier = _get_pipe()
+    lengths = classifier.tokenizer([texts[i] for i in valid_idx], return_length=True)["length"]
+    order = [valid_idx[j] for j in np.argsort(lengths, kind="stable")]
+    sorted_texts = [texts[i] for i in order]
 
-            # Ensure consistent formatting: output could be a dict (for single input) or list (for multiple)
-            outputs = [outputs] if isinstance(outputs, dict) else outputs
+    if batch_size is None:
+        batch_size = pick_batch_size(sorted_texts)
 
-            # Parse and store the top prediction and its confidence for each text
+    remaining = order
+    progress = tqdm(total=len(order), desc="Zero-shot classification")
+
+    while remaining:
+        consumed = 0
+        try:
+            # Run zero-shot classification in one call; the pipeline batches internally
+            outputs = classifier(
+                (texts[i] for i in remaining), candidate_labels=labels, batch_size=batch_size
+            )
+
+            # Scatter the top prediction and its confidence back to each text's original position
             for res in outputs:
-                results.append({
+                results[remaining[consumed]] = {
                     "funnel_stage": res['labels'][0],    # Label with highest score
                     "confidence": res['scores'][0]       # Corresponding confidence score
-                })
-        
+                }
+                consumed += 1
+                progress.update(1)
+            remaining = []
+
         except Exception as e:
-            # Log any errors during classification and return placeholder results
-            logging.error(f"Zero-shot batch failed: {e}")
-            results.extend([{"funnel_stage": "error", "confidence": 0}] * len(batch_raw))
-    
+            # Keep what was already classified; retry the rest (the longest texts) with smaller batches
+            remaining = remaining[consumed:]
+            if batch_size > 1:
+                batch_size //= 2
+                logging.warning(f"Zero-shot classification failed, retrying {len(remaining)} texts "
+                                f"with batch_size={batch_size}: {e}")
+                if torch.cuda.is_available():
+                    torch.cuda.empty_cache()
+                continue
+
+            # Log the failure and mark the texts that could not be classified as errors
+            logging.error(f"Zero-shot classification failed: {e}")
+            for position in remaining:
+                results[position] = {"funnel_stage": "error", "confidence": 0}
+            remaining = []
+
+    progress.close()
+
     # Return all results as a structured DataFrame
     return pd.DataFrame(results)
+
+
+def _get_embedder():
+    """
+    Load the sentence embedding model and pre-embed the label prototypes on first use.
+    sentence-transformers is imported here so the default zero-shot path doesn't need it.
+
+    Returns:
+    --------
+    tuple
+        (SentenceTransformer model, ndarray of normalized label embeddings in `labels` order)
+    """
+    global _embedder, _label_emb
+    if _embedder is None:
+        from sentence_transformers import SentenceTransformer  # Lightweight sentence embeddings
+
+        _embedder = SentenceTransformer(embedding_model_name, device="cuda" if device == 0 else "cpu")
+        _label_emb = _embedder.encode(
+            [label_prototypes[label] for label in labels], normalize_embeddings=True
+        )
+    return _embedder, _label_emb
+
+
+def batch_embedding_predict(texts, batch_size=128, temperature=0.05):
+    """
+    Classify texts into funnel stages by cosine similarity to pre-embedded label prototypes.
+    A much cheaper alternative to `batch_zero_shot_predict`: one small encoder pass per text
+    instead of one BART-large pass per (text, label) pair.
+
+    Parameters:
+    -----------
+    texts : list of str
+        A list of text inputs to be classified.
+    batch_size : int, optional (default=128)
+        Number of texts encoded per forward pass.
+    temperature : float, optional (default=0.05)
+        Softmax temperature applied to the cosine scores to produce a confidence value.
+
+    Returns:
+    --------
+    pd.DataFrame
+        A DataFrame with predicted 'funnel_stage' and associated 'confidence' score for each input text.
+        Invalid or empty texts get a 'skipped' placeholder, and a failed encode marks all rows as 'error'.
+    """
+    valid_idx = [i for i, text in enumerate(texts) if isinstance(text, str) and text.strip()]
+    results = [{"funnel_stage": "skipped", "confidence": 0}] * len(texts)
+
+    if not valid_idx:
+        return pd.DataFrame(results, columns=["funnel_stage", "confidence"])
+
+    try:
+        model, label_emb = _get_embedder()
+        emb = model.encode(
+            [texts[i] for i in valid_idx],
+            batch_size=batch_size,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+            show_progress_bar=True
+        )
+
+        # Cosine similarity (embeddings are normalized), then a tempered softmax for confidence
+        scores = emb @ label_emb.T
+        probs = np.exp((scores - scores.max(axis=1, keepdims=True)) / temperature)
+        probs /= probs.sum(axis=1, keepdims=True)
+        best = probs.argmax(axis=1)
+
+        for i, label_idx, prob in zip(valid_idx, best, probs[np.arange(len(best)), best]):
+            results[i] = {"funnel_stage": labels[label_idx], "confidence": float(prob)}
+
+    except Exception as e:
+        # Log the failure and mark every row as an error
+        logging.error(f"Embedding classification failed: {e}")
+        results = [{"funnel_stage": "error", "confidence": 0}] * len(texts)
+
+    return pd.DataFrame(results)
@@ -3,6 +3,10 @@
 import re                      # For regular expression operations
 import pandas as pd            # For handling pandas Series
 
+# Compile patterns once at import instead of on every call
+_KEEP = re.compile(r'[^a-z0-9\s]+')  # Punctuation and symbols to remove
+_WS = re.compile(r'\s+')             # Runs of whitespace to collapse
+
 def clean_text_column(series):
     """
     Clean and normalize text data in a pandas Series.
@@ -34,11 +38,9 @@ def clean_text_column(series):
     1    test data
     dtype: object
     """
-    return (
-        series.fillna('')  # Replace NaNs with empty string
-              .str.lower()  # Convert all text to lowercase
-              .str.encode('ascii', 'ignore').str.decode('utf-8')  # Remove non-ASCII characters
-              .str.replace(r'[^a-z0-9\s]', '', regex=True)  # Remove punctuation and symbols
-              .str.replace(r'\s+', ' ', regex=True)  # Collapse multiple spaces
-              .str.strip()  # Remove leading/trailing whitespace
-    )
+    # Single pass over the values: one output list instead of a new Series per step
+    cleaned = [
+        _WS.sub(' ', _KEEP.sub('', str(text).lower().encode('ascii', 'ignore').decode())).strip()
+        for text in series.fillna('').to_numpy()
+    ]
+    return pd.Series(cleaned, index=series.index, name=series.name)
@@ -1,16 +1,51 @@
 # modules/data_loader.py
 
-import os                      # For file path operations (optional, useful if extending)
+import os                      # For environment flags and output file paths
 import pandas as pd            # For reading and managing tabular data
 
-def load_datasets(file_paths):
+# Columns the pipeline uses downstream (url is carried through to the output file)
+DEFAULT_COLUMNS = ['keyword', 'url', 'title']
+
+
+def _read_csv(file, columns):
+    """
+    Read a single CSV with the multithreaded pyarrow parser, keeping only the needed columns.
+    Expected columns missing from the file (e.g. the optional 'keyword') are added as NaN.
+    Returns None (and prints the error) if the file cannot be read.
+    """
+    try:
+        # pyarrow rejects usecols entries that aren't in the file, so intersect with the header first
+        header = pd.read_csv(file, nrows=0).columns
+        present = [col for col in columns if col in header]
+
+        df = pd.read_csv(file, engine="pyarrow", usecols=present)  # Attempt to read CSV
+        df = df.reindex(columns=columns)                            # Missing optional columns become NaN
+
+        # Full-column EDA scans are expensive, so only log them when explicitly requested
+        if os.getenv("DEBUG_EDA"):
+            print(f"\n--- {file} ---")
+            print(df.head())                   # First few rows
+            print(df.info())                   # Column info and data types
+            print(df.describe())               # Summary statistics
+            print("Missing Values:\n", df.isnull().sum())  # Count of NaNs per column
+
+        return df
+
+    except Exception as e:
+        # Log the error and continue with next file
+        print(f"Error reading {file}: {e}")
+        return None
+
+
+def load_datasets(file_paths, columns=DEFAULT_COLUMNS):
     """
     Load multiple CSV files and return a single concatenated DataFrame.
 
     This function:
-    - Reads each file path from the input list.
-    - Loads each CSV into a pandas DataFrame.
-    - Logs key information such as head, info, statistical summary, and missing values.
+    - Reads each file path from the input list with the pyarrow CSV engine.
+    - Loads only the columns used downstream.
+    - Logs key information such as head, info, statistical summary, and missing values
+      when the DEBUG_EDA environment variable is set.
     - Handles errors gracefully and continues loading remaining files.
     - Concatenates all DataFrames into one.
 
@@ -18,36 +53,52 @@ def load_datasets(file_paths):
     -----------
     file_paths : list of str
         List of paths to CSV files.
+    columns : list of str
+        Columns to read from each file.
 
     Returns:
     --------
     pd.DataFrame
         A single pandas DataFrame containing all the rows from the input files.
         Files that fail to load are skipped with an error message.
-    
+
     Example:
     --------
     >>> load_datasets(['data/file1.csv', 'data/file2.csv'])
     """
 
-    dataframes = []
+    # Concatenate all successfully loaded DataFrames (failed files come back as None and are dropped)
+    return pd.concat((_read_csv(file, columns) for file in file_paths), ignore_index=True)
 
-    # Iterate over each file path in the list
-    for file in file_paths:
-        try:
-            df = pd.read_csv(file)  # Attempt to read CSV
-            dataframes.append(df)
 
-            # Log dataset overview for debugging or EDA purposes
-            print(f"\n--- {file} ---")
-            print(df.head())                   # First few rows
-            print(df.info())                   # Column info and data types
-            print(df.describe())               # Summary statistics
-            print("Missing Values:\n", df.isnull().sum())  # Count of NaNs per column
+def save_dataset(df, output_file, fmt=None):
+    """
+    Persist the final DataFrame, as zstd-compressed Parquet by default.
+
+    Parquet keeps nested columns such as 'extracted_entities' as native lists of structs
+    (no repr/literal_eval round-trip) and writes much faster and smaller than CSV.
+
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        DataFrame to save.
+    output_file : str
+        Target path. For Parquet, a '.csv' extension is replaced with '.parquet'.
+    fmt : str, optional
+        'parquet' or 'csv'. Defaults to the OUTPUT_FORMAT environment variable, then 'parquet'.
+
+    Returns:
+    --------
+    str
+        The path that was written.
+    """
+    fmt = (fmt or os.getenv("OUTPUT_FORMAT") or "parquet").lower()
 
-        except Exception as e:
-            # Log the error and continue with next file
-            print(f"Error reading {file}: {e}")
+    if fmt == "csv":
+        df.to_csv(output_file, index=False)
+        return output_file
 
-    # Concatenate all successfully loaded DataFrames
-    return pd.concat(dataframes, ignore_index=True)
+    root, ext = os.path.splitext(output_file)
+    path = root + ".parquet" if ext.lower() == ".csv" else output_file
+    df.to_parquet(path, engine="pyarrow", compression="zstd", compression_level=3, index=False)
+    return path
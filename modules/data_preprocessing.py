@@ -3,11 +3,48 @@
 import re
 import pandas as pd
 from nltk.corpus import stopwords       # NLTK stopword list
-from nltk.tokenize import word_tokenize # Tokenizer for splitting text into words
 
 # Initialize English stopword set once for efficiency
 stop_words = set(stopwords.words('english'))
 
+# Whole-word alternation of all stopwords (longest first), compiled once
+_STOPWORDS = re.compile(
+    r'\b(?:' + '|'.join(map(re.escape, sorted(stop_words, key=len, reverse=True))) + r')\b',
+    re.IGNORECASE
+)
+_WS = re.compile(r'\s+')
+
+# Leading-keyword patterns for question types, compiled once into a single alternation.
+# Group order matters: the first matching group wins, as in the original if-chain.
+_QTYPE = re.compile(
+    r'^(?P<how>how)\b'
+    r'|^(?P<why>why)\b'
+    r'|^(?P<what>what)\b'
+    r'|^(?P<when>when)\b'
+    r'|^(?P<where>where)\b'
+    r'|^(?P<who>who|whom)\b'
+    r'|^(?P<bool>is|are|was|were|do|does|did|can|could|will|would|should|am|have|has)\b',
+    re.IGNORECASE
+)
+_QTYPE_LABELS = {
+    'how': 'instructional',
+    'why': 'reasoning',
+    'what': 'informational',
+    'when': 'temporal',
+    'where': 'locational',
+    'who': 'personal',
+    'bool': 'boolean',
+}
+
+# Leading words that mark a text as a question
+_Q_STARTERS = frozenset((
+    'what', 'why', 'how', 'where', 'when', 'who', 'whom', 'which',
+    'is', 'are', 'can', 'could', 'do', 'does', 'did', 'will',
+    'would', 'shall', 'should', 'may', 'might', 'am'
+))
+
+_COMPARATIVE = re.compile(r'\b(?:which|better|best|vs)\b', re.IGNORECASE)
+
 def get_question_type(text):
     """
     Categorize a question into one of several predefined types based on leading keywords.
@@ -28,26 +65,45 @@ def get_question_type(text):
     if not isinstance(text, str) or not text.strip():
         return 'other'
     
-    text = text.lower().strip()
+    text = text.strip()
 
     # Rule-based keyword matching to identify question intent
-    if re.match(r'^how\b', text): return 'instructional'
-    if re.match(r'^why\b', text): return 'reasoning'
-    if re.match(r'^what\b', text): return 'informational'
-    if re.match(r'^when\b', text): return 'temporal'
-    if re.match(r'^where\b', text): return 'locational'
-    if re.match(r'^(who|whom)\b', text): return 'personal'
-    if re.match(r'^(is|are|was|were|do|does|did|can|could|will|would|should|am|have|has)\b', text): return 'boolean'
-    if re.match(r'^(should|would)\b', text): return 'decision'
-    if re.search(r'\b(which|better|best|vs)\b', text): return 'comparative'
+    match = _QTYPE.match(text)
+    if match: return _QTYPE_LABELS[match.lastgroup]
+    if _COMPARATIVE.search(text): return 'comparative'
 
     return 'other'
 
 
+def get_question_types(series):
+    """
+    Vectorized version of `get_question_type` for a whole pandas Series.
+    Runs the compiled keyword alternation once over the column instead of calling Python per row.
+
+    Parameters:
+    -----------
+    series : pd.Series
+        Question strings (non-strings and empty values are typed as 'other').
+
+    Returns:
+    --------
+    pd.Series
+        Question type labels aligned with the input index.
+    """
+    text = series.fillna('').astype(str).str.strip()
+
+    matched = text.str.extract(_QTYPE).notna()
+    types = matched.idxmax(axis=1).map(_QTYPE_LABELS).where(matched.any(axis=1))
+
+    comparative = text.str.contains(_COMPARATIVE).map({True: 'comparative', False: 'other'})
+    return types.fillna(comparative)
+
+
 def filtered_stopwords(text):
     """
     Remove English stopwords from input text using NLTK's stopword list.
     This step keeps only meaningful words that might help distinguish one question from another, which is especially useful before vectorizing the text.
+    Input is expected to be cleaned text, so tokens are simply whitespace-separated words.
 
     Parameters:
     -----------
@@ -62,8 +118,30 @@ def filtered_stopwords(text):
     if pd.isnull(text):
         return ''
     
-    tokens = word_tokenize(text)
-    return ' '.join([w for w in tokens if w.lower() not in stop_words])
+    return ' '.join([w for w in str(text).split() if w.lower() not in stop_words])
+
+
+def remove_stopwords(series):
+    """
+    Vectorized version of `filtered_stopwords` for a whole pandas Series.
+    Strips every stopword with one compiled regex pass and then collapses the leftover whitespace.
+
+    Parameters:
+    -----------
+    series : pd.Series
+        Cleaned text strings.
+
+    Returns:
+    --------
+    pd.Series
+        Strings with stopwords removed, aligned with the input index.
+    """
+    return (
+        series.fillna('').astype(str)
+              .str.replace(_STOPWORDS, '', regex=True)  # Drop stopwords as whole words
+              .str.replace(_WS, ' ', regex=True)        # Collapse the gaps they leave
+              .str.strip()
+    )
 
 
 def is_question(text):
@@ -81,19 +159,42 @@ def is_question(text):
     str or None
         Returns the original text if it's a question, else returns None.
     """
-    question_starters = (
-        'what', 'why', 'how', 'where', 'when', 'who', 'whom', 'which',
-        'is', 'are', 'can', 'could', 'do', 'does', 'did', 'will',
-        'would', 'shall', 'should', 'may', 'might', 'am'
-    )
-
     if not text:
         return None
 
-    words = text.strip().split()
+    stripped = text.strip()
+    if not stripped:
+        return None
 
     # If it ends with "?" or starts with a known interrogative, consider it a question
-    return text if (text.endswith('?') or words[0].lower() in question_starters) else None
+    if stripped.endswith('?'):
+        return text
+
+    # Only split off the first word instead of tokenizing the whole string
+    first = stripped.split(None, 1)[0].lower()
+    return text if first in _Q_STARTERS else None
+
+
+def detect_questions(series):
+    """
+    Vectorized version of `is_question` for a whole pandas Series.
+    A value counts as a question if it ends with "?" or its first word is a known interrogative.
+
+    Parameters:
+    -----------
+    series : pd.Series
+        Text strings.
+
+    Returns:
+    --------
+    pd.Series
+        The original values where they are questions, missing values elsewhere.
+    """
+    stripped = series.fillna('').astype(str).str.strip()
+    first = stripped.str.split(n=1).str[0].str.lower()   # Split off the first word only
+
+    is_q = stripped.str.endswith('?') | first.isin(_Q_STARTERS)
+    return series.where(is_q & (stripped != ''))
 
 
 def drop_duplicates(df, subset_cols=['keyword_cleaned', 'question_text_validated']):
@@ -129,7 +230,6 @@ def add_question_length(df, question_col='question_text_validated'):
     pd.DataFrame
         Original DataFrame with an additional 'question_length' column.
     """
-    df['question_length'] = df[question_col].apply(
-        lambda x: len(x.split()) if isinstance(x, str) else 0
-    )
+    # Vectorized word count; missing questions count as 0 words (int32 is plenty for lengths)
+    df['question_length'] = df[question_col].fillna('').astype(str).str.split().str.len().astype('int32')
     return df
@@ -3,16 +3,21 @@
 import matplotlib.pyplot as plt              # For plotting and visualization
 import seaborn as sns                       # For attractive statistical plots
 import os                                   # For file and directory handling
+import numpy as np                          # For the float32 feature dtype
 
-from sklearn.feature_extraction.text import TfidfVectorizer  # Convert text to numeric features
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfTransformer  # Convert text to numeric features
 from sklearn.decomposition import TruncatedSVD               # Dimensionality reduction
-from sklearn.cluster import KMeans                          # Clustering algorithm
+from sklearn.preprocessing import Normalizer                 # Row-wise L2 normalization
+from sklearn.cluster import MiniBatchKMeans                 # Clustering algorithm (mini-batch)
 
-def perform_clustering(df, text_column='title_cleaned', n_clusters=3):
+def perform_clustering(df, text_column='title_cleaned', n_clusters=3, n_components=50):
     """
-    Perform text clustering using TF-IDF, KMeans, and SVD for 2D visualization.
+    Perform text clustering using hashed TF-IDF, SVD (LSA), and MiniBatchKMeans, with a 2D view for visualization.
     This can help with topic discovery, FAQ grouping, or content recommendation.
 
+    The TF-IDF matrix is reduced once to `n_components` dense dimensions; KMeans runs on that
+    small matrix and the first two components double as the 2D scatter coordinates.
+
     Parameters:
     -----------
     df : pd.DataFrame
@@ -21,6 +26,8 @@ def perform_clustering(df, text_column='title_cleaned', n_clusters=3):
         Column in the DataFrame with cleaned text.
     n_clusters : int
         Number of clusters to form.
+    n_components : int
+        Number of SVD components used for clustering (capped below the number of documents).
 
     Returns:
     --------
@@ -30,22 +37,34 @@ def perform_clustering(df, text_column='title_cleaned', n_clusters=3):
         2D array of SVD-reduced components for visualization.
     """
 
-    # Step 1: TF-IDF Vectorization with stopword removal and bigrams
-    tfidf_vectorizer = TfidfVectorizer(
-        stop_words="english", 
-        max_df=0.8,               # Ignore terms in more than 80% of documents
-        min_df=3,                 # Ignore terms in fewer than 3 documents
-        ngram_range=(1, 2)        # Include unigrams and bigrams
+    # Step 1: TF-IDF features with stopword removal and bigrams, hashed in a single pass (no vocabulary kept)
+    hashing_vectorizer = HashingVectorizer(
+        stop_words="english",
+        ngram_range=(1, 2),       # Include unigrams and bigrams
+        n_features=2**18,         # Hash space; collisions are negligible at FAQ-corpus scale
+        alternate_sign=False,     # Keep counts non-negative so IDF weighting stays meaningful
+        norm=None,                # Normalize after IDF weighting instead
+        dtype=np.float32          # Half the memory of float64, ample precision for clustering
     )
-    X = tfidf_vectorizer.fit_transform(df[text_column])
-
-    # Step 2: KMeans clustering
-    kmeans = KMeans(n_clusters=n_clusters, random_state=42)
-    df['text_cluster'] = kmeans.fit_predict(X)
+    X = TfidfTransformer().fit_transform(hashing_vectorizer.transform(df[text_column]))
+
+    # Step 2: Single SVD pass over the sparse matrix; the rank is bounded by the smaller
+    # dimension, which with 2**18 hashed features is the number of documents
+    svd = TruncatedSVD(n_components=max(2, min(n_components, min(X.shape) - 1)), random_state=42)
+    reduced = svd.fit_transform(X)
+
+    # Step 3: KMeans clustering on the small dense matrix (rows re-normalized, as TF-IDF rows were)
+    kmeans = MiniBatchKMeans(
+        n_clusters=n_clusters,
+        random_state=42,
+        batch_size=1024,
+        n_init='auto',
+        max_iter=100
+    )
+    df['text_cluster'] = kmeans.fit_predict(Normalizer().fit_transform(reduced))
 
-    # Step 3: Dimensionality reduction for visualization
-    svd = TruncatedSVD(n_components=2, random_state=42)
-    components = svd.fit_transform(X)
+    # Step 4: The leading two components are the 2D view for visualization
+    components = reduced[:, :2]
 
     return df, components
 
@@ -16,7 +16,8 @@ def print_question_type_by_cluster(df):
     Prints a grouped frequency count of question types within each cluster.
     """
     print("\n--- Cluster-wise Question Type Distribution ---")
-    print(df.groupby('text_cluster')['question_type'].value_counts())
+    counts = df.groupby('text_cluster')['question_type'].value_counts()
+    print(counts[counts > 0])  # Categorical counts list every type per cluster; drop the empty ones
 
 
 def print_sample_questions_per_cluster(df, n=3):
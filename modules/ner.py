@@ -3,8 +3,38 @@
 import spacy                      # For natural language processing
 import logging                    # For error logging
 
-# Load small English language model (includes tokenization, tagging, NER, etc.)
-nlp = spacy.load("en_core_web_sm")
+# Load small English language model with only the components NER needs (tagging, parsing and lemmas are unused)
+nlp = spacy.load("en_core_web_sm", disable=["tagger", "parser", "attribute_ruler", "lemmatizer"])
+
+# Human-readable label descriptions, looked up once instead of per entity
+_EXPLAIN_CACHE = {
+    label: spacy.explain(label) or "Unknown" for label in nlp.get_pipe("ner").labels
+}
+
+
+def _explain(label):
+    """
+    Return the cached description for an entity label, computing it on first sight.
+    """
+    if label not in _EXPLAIN_CACHE:
+        _EXPLAIN_CACHE[label] = spacy.explain(label) or "Unknown"
+    return _EXPLAIN_CACHE[label]
+
+
+def _doc_entities(doc):
+    """
+    Convert the entities of a processed spaCy Doc into a list of dictionaries.
+    """
+    return [
+        {
+            "text": ent.text,
+            "start": ent.start_char,
+            "end": ent.end_char,
+            "label": ent.label_,
+            "label_desc": _explain(ent.label_)
+        }
+        for ent in doc.ents
+    ]
 
 def extract_entities(text):
     """
@@ -42,18 +72,42 @@ def extract_entities(text):
         doc = nlp(str(text).strip())
 
         # Extract and return structured entity data
-        return [
-            {
-                "text": ent.text,
-                "start": ent.start_char,
-                "end": ent.end_char,
-                "label": ent.label_,
-                "label_desc": spacy.explain(ent.label_) or "Unknown"
-            }
-            for ent in doc.ents
-        ]
+        return _doc_entities(doc)
 
     except Exception as e:
         # Log any unexpected error and return empty result
         logging.error(f"NER failed for text: {text} | Error: {e}")
         return []
+
+
+def extract_entities_batch(texts, batch_size=256, n_process=1):
+    """
+    Extract named entities from many texts at once using spaCy's `nlp.pipe`.
+    Batching lets spaCy process texts together (optionally across worker processes) instead of one call per row.
+
+    Parameters:
+    -----------
+    texts : list of str
+        Input texts from which to extract named entities.
+    batch_size : int
+        Number of texts spaCy buffers per batch.
+    n_process : int, optional (default=1)
+        Number of worker processes. Each worker reloads the spaCy model, so this only pays off
+        for large inputs, and the calling script must be import-safe (`if __name__ == "__main__":`)
+        on spawn-based platforms such as Windows and macOS.
+
+    Returns:
+    --------
+    List[List[dict]]
+        One list of entity dictionaries per input text, in the same format as `extract_entities`.
+
+    If batch processing fails, logs the error and falls back to `extract_entities` per text.
+    """
+    try:
+        docs = nlp.pipe((str(text).strip() for text in texts), batch_size=batch_size, n_process=n_process)
+        return [_doc_entities(doc) for doc in docs]
+
+    except Exception as e:
+        # Log the failure and retry text by text so one bad input doesn't lose the whole column
+        logging.error(f"Batch NER failed, falling back to per-text extraction | Error: {e}")
+        return [extract_entities(text) for text in texts]
@@ -54,7 +54,6 @@ def download_nlp_resources():
     Download required NLTK and spaCy resources for NLP processing.
 
     Resources downloaded:
-    - NLTK tokenizer ('punkt')
     - NLTK stopword list
     - spaCy's small English model ('en_core_web_sm')
 
@@ -63,7 +62,6 @@ def download_nlp_resources():
     None
     """
     try:
-        nltk.download('punkt')
         nltk.download('stopwords')
         spacy.cli.download("en_core_web_sm")
     except Exception as e:
@@ -74,7 +74,8 @@ def plot_funnel_stage_distribution(df, save=False):
     A pie chart of funnel stages, optionally saved as 'funnel_stage_pie.png'.
     """
     fig, ax = plt.subplots(figsize=(6, 6))
-    df['funnel_stage'].value_counts().plot.pie(
+    counts = df['funnel_stage'].value_counts()
+    counts[counts > 0].plot.pie(                 # Categorical counts include unused stages; hide empty slices
         autopct="%1.1f%%", 
         startangle=90,
         colors=sns.color_palette("pastel"),